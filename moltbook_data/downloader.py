@@ -13,39 +13,178 @@ Uses async parallel fetching with rate limiting.
 """
 
 import asyncio
+import codecs
+import functools
 import json
-import re
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from dataclasses import dataclass, field
 
 import httpx
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeElapsedColumn
 
+try:
+    import orjson
+except ImportError:  # Optional speedup (pip install moltbook-data[fast])
+    orjson = None
+
 # Configuration
 BASE_URL = "https://www.moltbook.com/api/v1"
 DATA_DIR = Path("data")
 
-# Rate limiting: 100 requests/min = ~1.67/sec
-# With parallel requests, we batch and add delays
+# Rate limiting: 100 requests/min = ~1.67/sec, enforced by a token bucket
+# that allows bursts of up to MAX_CONCURRENT requests
 MAX_CONCURRENT = 10  # Concurrent requests
-BATCH_DELAY = 0.5    # Delay between batches to respect rate limits
+RATE_LIMIT_PER_MINUTE = 100
+
+# Keep idle connections open long enough to survive rate-limit pacing
+# (~6s between requests per connection), 429 pauses and the index
+# generation between phases
+KEEPALIVE_EXPIRY = 60.0
+
+# Checkpointing: save state after this many newly completed items
+CHECKPOINT_INTERVAL = 100
+# Rewrite the full checkpoint snapshot once the journal has this many entries
+JOURNAL_COMPACT_ENTRIES = 50_000
+# DownloadState sets that can be restored from journal entries
+JOURNALED_SETS = ("submolts_fetched", "agents_fetched", "agent_names_discovered", "submolt_names_discovered")
+
+# Threads for reading existing data files (migration, index generation)
+READ_WORKERS = 8
 
 # Retry configuration
 MAX_RETRIES = 3
-RETRY_BACKOFF_BASE = 2.0  # Exponential backoff: 2s, 4s, 8s
+RETRY_BACKOFF_BASE = 2.0  # Exponential backoff: up to 1s, 2s, 4s (full jitter)
+MAX_RETRY_AFTER = 60.0  # Cap on a server's Retry-After; a 429 pauses every worker
 
 console = Console()
 
 
+# Cached [iso_string, monotonic_time] for now_iso()
+_now_iso_cache = ["", float("-inf")]
+
+
+def now_iso() -> str:
+    """
+    Current UTC time as an ISO string, refreshed at most every half second.
+
+    Items are stamped in bursts, so sub-second precision isn't needed and
+    this avoids building a datetime per saved item.
+    """
+    t = time.monotonic()
+    if t - _now_iso_cache[1] > 0.5:
+        _now_iso_cache[:] = [datetime.now(timezone.utc).isoformat(), t]
+    return _now_iso_cache[0]
+
+
+# Shared default for optional response objects on per-item paths; never mutated
+_EMPTY_DICT: dict = {}
+
+
+# Characters problematic on Windows/Unix: < > : " / \ | ? *
+_FILENAME_TRANSLATION = str.maketrans({c: "_" for c in '<>:"/\\|?*'})
+
+
 def sanitize_filename(name: str) -> str:
     """Sanitize a string for use as a filename across all platforms."""
-    # Replace characters problematic on Windows/Unix: < > : " / \ | ? *
-    return re.sub(r'[<>:"/\\|?*]', '_', name)
+    return name.translate(_FILENAME_TRANSLATION)
+
+
+def dump_json(data, f, indent: bool = True):
+    """
+    Serialize data as JSON (indented or compact) into the binary file f.
+
+    orjson, when installed, produces a single bytes buffer; the stdlib
+    fallback streams chunks into the file instead of building a copy. The
+    fallback also covers data orjson can't encode, such as strings with
+    lone surrogates.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            f.write(orjson.dumps(data, option=option, default=str))
+            return
+        except orjson.JSONEncodeError:
+            pass
+    json.dump(data, codecs.getwriter("utf-8")(f), **json_format(indent), default=str)
+
+
+def json_format(indent: bool) -> dict:
+    """
+    Stdlib json formatting arguments for the indented or compact layout.
+
+    Non-ASCII text stays \\u-escaped (unlike orjson's raw UTF-8), so strings
+    holding lone surrogates can still be written.
+    """
+    return {"indent": 2} if indent else {"separators": (",", ":")}
+
+
+def loads_json(data: bytes | str):
+    """
+    Parse JSON bytes or text, using orjson when it is installed.
+
+    orjson rejects lone UTF-16 surrogate escapes (e.g. a truncated emoji,
+    "\\ud83d") that json.loads accepts, so anything orjson refuses is retried
+    with the stdlib parser. Input neither accepts raises orjson's error, so
+    callers only ever see json.JSONDecodeError.
+    """
+    if orjson is None:
+        return json.loads(data)
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError as e:
+        try:
+            return json.loads(data)
+        except ValueError:
+            raise e from None
+
+
+def fsync_directory(path: Path):
+    """Flush a directory's entries (e.g. a completed rename) to disk. No-op outside POSIX."""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
-def archive_post_if_changed(posts_dir: Path, post_id: str, new_data: dict) -> bool:
+def write_json(path: Path, data: dict, durable: bool = False, indent: bool = True):
+    """
+    Serialize data as JSON with dump_json() and write it to path atomically.
+
+    With durable=True the data and the rename are fsynced before returning;
+    that's reserved for the checkpoint, since per-item saves can be
+    re-downloaded if lost. With indent=False the output is compact.
+    """
+    # A thread runs one write at a time, so pid + thread id keeps concurrent
+    # saves of the same path from sharing a temp file (unlike mkstemp, open()
+    # still honours the umask for the final file's permissions)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            dump_json(data, f, indent)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if durable:
+        fsync_directory(path.parent)
+
+
+def archive_post_if_changed(posts_dir: Path, post_id: str, new_data: dict, pretty: bool = False) -> bool:
     """
     Archive existing post if content has changed.
     Returns True if the post was archived (i.e., content changed).
@@ -56,7 +195,7 @@ def archive_post_if_changed(posts_dir: Path, post_id: str, new_data: dict) -> bo
         return False  # No existing file to archive
 
     try:
-        existing_data = json.loads(current_file.read_text())
+        existing_data = loads_json(current_file.read_bytes())
     except (json.JSONDecodeError, OSError):
         return False  # Corrupted file, just overwrite
 
@@ -88,44 +227,93 @@ def archive_post_if_changed(posts_dir: Path, post_id: str, new_data: dict) -> bo
     archive_file = archive_dir / f"{safe_timestamp}.json"
 
     # Write the already-loaded data to avoid race condition
-    archive_file.write_text(json.dumps(existing_data, indent=2, default=str))
+    write_json(archive_file, existing_data, indent=pretty)
 
     return True
 
 
-def identify_posts_needing_refresh(
+def store_post(posts_dir: Path, post_id: str, data: dict, refresh: bool, pretty: bool = False) -> bool:
+    """
+    Save a post, archiving the previous version first if this is a refresh.
+    Returns True if the previous version was archived.
+    """
+    archived = refresh and archive_post_if_changed(posts_dir, post_id, data, pretty)
+    write_json(posts_dir / f"{post_id}.json", data, indent=pretty)
+    return archived
+
+
+def scan_feed_posts(
     all_posts: list[dict],
     state: "DownloadState"
-) -> tuple[list[dict], list[dict]]:
+) -> tuple[list[str], list[str]]:
     """
-    Categorize posts into new posts and posts needing refresh.
+    Record agent/submolt names from feed summaries and categorize posts
+    into new posts and posts needing refresh, in a single pass.
 
     Returns:
-        (new_posts, posts_to_refresh)
+        (new_post_ids, refresh_post_ids)
     """
     new_posts = []
     posts_to_refresh = []
+    # Pagination can return the same post twice; queue each one only once
+    seen = set()
+    # Bound once: this runs over every post in the feed
+    downloaded = state.posts_with_details
+    tracked_count = state.post_comment_counts.get
+    discover_agent = state.discover_agent
+    discover_submolt = state.discover_submolt
 
     for post in all_posts:
+        author = post.get("author")
+        if author:
+            name = author.get("name") or author.get("username")
+            if name:
+                discover_agent(name)
+        submolt = post.get("submolt")
+        if submolt:
+            name = submolt.get("name")
+            if name:
+                discover_submolt(name)
+
         post_id = post.get("id")
-        if not post_id:
+        if not post_id or post_id in seen:
             continue
+        seen.add(post_id)
 
-        api_comment_count = post.get("comment_count", 0)
-
-        if post_id not in state.posts_with_details:
+        if post_id not in downloaded:
             # Never downloaded before
-            new_posts.append(post)
-        elif post_id not in state.post_comment_counts:
+            new_posts.append(post_id)
+            continue
+
+        known_count = tracked_count(post_id)
+        if known_count is None:
             # Post exists but no tracked count (e.g., partial migration) - refresh it
-            posts_to_refresh.append(post)
-        elif api_comment_count > state.post_comment_counts[post_id]:
+            posts_to_refresh.append(post_id)
+        elif post.get("comment_count", 0) > known_count:
             # Comment count increased - refresh to get new comments
-            posts_to_refresh.append(post)
+            posts_to_refresh.append(post_id)
 
     return new_posts, posts_to_refresh
 
 
+def read_json_files(paths: list[Path], summarize):
+    """
+    Parse each JSON file and yield (path, summarize(data)) in input order,
+    or (path, None) for files that can't be read or parsed.
+
+    Files are read on READ_WORKERS threads so disk reads overlap; summarize
+    runs there too, so only the summaries are kept, not whole documents.
+    """
+    def read(path: Path):
+        try:
+            return path, summarize(loads_json(path.read_bytes()))
+        except (json.JSONDecodeError, OSError):
+            return path, None
+
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+        yield from pool.map(read, paths)
+
+
 def migrate_comment_counts(data_dir: Path, state: "DownloadState") -> int:
     """
     Backfill post_comment_counts from existing post files.
@@ -135,59 +323,148 @@ def migrate_comment_counts(data_dir: Path, state: "DownloadState") -> int:
     posts_dir = data_dir / "posts"
     migrated = 0
 
-    for post_file in posts_dir.glob("*.json"):
-        post_id = post_file.stem
-
-        # Skip if already tracked
-        if post_id in state.post_comment_counts:
-            continue
+    # Skip posts that are already tracked
+    untracked = [f for f in posts_dir.glob("*.json") if f.stem not in state.post_comment_counts]
+    counts = read_json_files(untracked, lambda data: data.get("post", {}).get("comment_count", 0))
 
-        try:
-            data = json.loads(post_file.read_text())
-            comment_count = data.get("post", {}).get("comment_count", 0)
-            state.post_comment_counts[post_id] = comment_count
-            migrated += 1
-        except (json.JSONDecodeError, OSError):
+    for post_file, comment_count in counts:
+        if comment_count is None:
             continue
+        state.post_comment_counts[post_file.stem] = comment_count
+        migrated += 1
 
     return migrated
 
 
-@dataclass
+def compact_checkpoint(path: Path, data: dict):
+    """Write a full checkpoint snapshot and drop the journal it supersedes."""
+    write_json(path, data, durable=True)
+    path.with_suffix(".journal").unlink(missing_ok=True)
+
+
+def append_journal(path: Path, entries: list[list]):
+    """Append state changes to the checkpoint journal, one JSON array per line."""
+    if not entries:
+        return
+    with path.with_suffix(".journal").open("a") as f:
+        f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+@dataclass(slots=True)
 class DownloadState:
-    """Tracks download progress for checkpointing."""
+    """
+    Tracks download progress for checkpointing.
+
+    The checkpoint is a full JSON snapshot plus an append-only journal of
+    changes made since that snapshot. Regular saves only append new entries
+    to the journal; the snapshot is rewritten (compacted) when the journal
+    grows past JOURNAL_COMPACT_ENTRIES or when explicitly requested.
+    """
     posts_with_details: set[str] = field(default_factory=set)
     submolts_fetched: set[str] = field(default_factory=set)
     agents_fetched: set[str] = field(default_factory=set)
+    # Discovered names still waiting to be fetched (fetched names are dropped)
     agent_names_discovered: set[str] = field(default_factory=set)
     submolt_names_discovered: set[str] = field(default_factory=set)
     last_checkpoint: str = ""
     # Track comment counts to detect posts needing refresh
     post_comment_counts: dict[str, int] = field(default_factory=dict)
-
-    def save(self, path: Path):
-        """Save checkpoint to disk."""
-        data = {
+    # Changes not yet written to the journal
+    _pending: list[list] = field(default_factory=list, init=False, repr=False)
+    # Entries in the on-disk journal; None until this state matches what's on disk
+    _journal_entries: int | None = field(default=None, init=False, repr=False)
+
+    def mark_post_done(self, post_id: str, comment_count: int):
+        """Record a downloaded post and its comment count."""
+        self.posts_with_details.add(post_id)
+        self.post_comment_counts[post_id] = comment_count
+        self._pending.append(["post_comment_counts", post_id, comment_count])
+
+    def mark_submolt_done(self, name: str):
+        """Record a downloaded submolt."""
+        self.submolts_fetched.add(name)
+        self.submolt_names_discovered.discard(name)
+        self._pending.append(["submolts_fetched", name])
+
+    def mark_agent_done(self, name: str):
+        """Record a downloaded agent profile."""
+        self.agents_fetched.add(name)
+        self.agent_names_discovered.discard(name)
+        self._pending.append(["agents_fetched", name])
+
+    def discover_agent(self, name: str):
+        """Record an agent name to fetch later, unless it's already known or fetched."""
+        if name not in self.agent_names_discovered and name not in self.agents_fetched:
+            self.agent_names_discovered.add(name)
+            self._pending.append(["agent_names_discovered", name])
+
+    def discover_agents(self, names):
+        """
+        Record many agent names at once (e.g. every comment author in a post).
+
+        Filters with set operations instead of a per-name discover_agent call.
+        """
+        new = set(names) - self.agent_names_discovered - self.agents_fetched
+        self.agent_names_discovered |= new
+        self._pending.extend(["agent_names_discovered", name] for name in new)
+
+    def discover_submolt(self, name: str):
+        """Record a submolt name to fetch later, unless it's already known or fetched."""
+        if name not in self.submolt_names_discovered and name not in self.submolts_fetched:
+            self.submolt_names_discovered.add(name)
+            self._pending.append(["submolt_names_discovered", name])
+
+    def to_dict(self) -> dict:
+        """Snapshot state as a JSON-serializable dict."""
+        return {
             "posts_with_details": list(self.posts_with_details),
             "submolts_fetched": list(self.submolts_fetched),
             "agents_fetched": list(self.agents_fetched),
             "agent_names_discovered": list(self.agent_names_discovered),
             "submolt_names_discovered": list(self.submolt_names_discovered),
-            "last_checkpoint": datetime.now(timezone.utc).isoformat(),
-            "post_comment_counts": self.post_comment_counts,
+            "last_checkpoint": now_iso(),
+            "post_comment_counts": dict(self.post_comment_counts),
         }
-        # Write atomically
-        tmp_path = path.with_suffix(".tmp")
-        tmp_path.write_text(json.dumps(data, indent=2, default=str))
-        tmp_path.rename(path)
+
+    def _checkpoint_writer(self, path: Path, compact: bool):
+        """
+        Collect what the next checkpoint needs to write and return a
+        zero-argument function that writes it.
+
+        Runs on the calling thread so the sets can't change size while being
+        copied; the returned writer is safe to run in a worker thread.
+        """
+        entries, self._pending = self._pending, []
+
+        journal_full = (
+            self._journal_entries is None or
+            self._journal_entries + len(entries) > JOURNAL_COMPACT_ENTRIES
+        )
+        if compact or journal_full or not path.exists():
+            self._journal_entries = 0
+            data = self.to_dict()
+            return lambda: compact_checkpoint(path, data)
+
+        self._journal_entries += len(entries)
+        return lambda: append_journal(path, entries)
+
+    def save(self, path: Path, compact: bool = False):
+        """Save checkpoint to disk."""
+        self._checkpoint_writer(path, compact)()
+
+    async def save_async(self, path: Path, compact: bool = False, pool: ThreadPoolExecutor | None = None):
+        """Save checkpoint to disk from a worker thread (pool, or the loop's default executor)."""
+        await asyncio.get_running_loop().run_in_executor(pool, self._checkpoint_writer(path, compact))
 
     @classmethod
     def load(cls, path: Path) -> "DownloadState":
-        """Load checkpoint from disk."""
+        """Load checkpoint snapshot from disk and replay its journal."""
         if not path.exists():
             return cls()
         try:
-            data = json.loads(path.read_text())
+            data = loads_json(path.read_bytes())
             state = cls()
             state.posts_with_details = set(data.get("posts_with_details", []))
             state.submolts_fetched = set(data.get("submolts_fetched", []))
@@ -196,22 +473,156 @@ class DownloadState:
             state.submolt_names_discovered = set(data.get("submolt_names_discovered", []))
             state.last_checkpoint = data.get("last_checkpoint", "")
             state.post_comment_counts = data.get("post_comment_counts", {})
-            return state
         except (json.JSONDecodeError, KeyError) as e:
             console.print(f"[yellow]Warning: Could not load checkpoint: {e}[/yellow]")
             return cls()
 
+        state._journal_entries = state._replay_journal(path.with_suffix(".journal"))
+        # Older checkpoints (and journal replay) keep names that were fetched since discovery
+        state.agent_names_discovered -= state.agents_fetched
+        state.submolt_names_discovered -= state.submolts_fetched
+        return state
+
+    def _replay_journal(self, journal_path: Path) -> int | None:
+        """
+        Apply journal entries on top of the loaded snapshot.
+        Returns the entry count, or None if the journal has a torn line and
+        must be compacted before anything else is appended to it.
+        """
+        if not journal_path.exists():
+            return 0
+
+        replayed = 0
+        torn = False
+        with journal_path.open() as f:
+            for line in f:
+                try:
+                    name, key, *value = loads_json(line)
+                except (json.JSONDecodeError, ValueError):
+                    # Partially written last line after a crash
+                    torn = True
+                    continue
+
+                if name == "post_comment_counts":
+                    self.posts_with_details.add(key)
+                    self.post_comment_counts[key] = value[0]
+                elif name in JOURNALED_SETS:
+                    getattr(self, name).add(key)
+                else:
+                    continue
+                replayed += 1
+        return None if torn else replayed
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter so concurrent retries don't fire in lockstep."""
+    return random.uniform(0, RETRY_BACKOFF_BASE ** attempt)
+
+
+def retry_delay(response: httpx.Response, attempt: int) -> float:
+    """
+    Delay before retrying a response, honoring Retry-After (seconds or
+    HTTP-date) up to MAX_RETRY_AFTER. Non-finite values like "inf" or "nan"
+    are ignored in favour of the usual backoff.
+    """
+    retry_after = response.headers.get("Retry-After", "")
+    try:
+        delay = float(retry_after)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return backoff_delay(attempt)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    if not math.isfinite(delay):
+        return backoff_delay(attempt)
+    return min(MAX_RETRY_AFTER, max(0.0, delay))
+
+
+class RateLimiter:
+    """
+    Token bucket allowing bursts of `capacity` requests, refilled at `rate` per second.
+
+    The refill rate adapts AIMD-style: it halves each time the server
+    throttles us and creeps back up toward `rate` with every successful
+    request, so a server that is stricter than the documented limit is
+    probed rather than hammered.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until the budget allows another request, then consume one token."""
+        async with self._lock:
+            while True:
+                # last_refill is in the future while a pause() is in effect;
+                # nothing refills until it has passed
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.last_refill) * self.rate)
+                self.last_refill = max(self.last_refill, now)
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                # Holding the lock while sleeping keeps waiters in FIFO order.
+                # Re-check after waking, since pause() may have pushed last_refill out.
+                await asyncio.sleep(self.last_refill - now + (1 - self.tokens) / self.rate)
+
+    def pause(self, delay: float):
+        """
+        Hold off all requests for `delay` seconds, e.g. after the server
+        responds 429. Waiters sleep out the pause in acquire().
+        """
+        self.tokens = 0
+        self.last_refill = max(self.last_refill, time.monotonic() + delay)
+
+    def slow_down(self):
+        """Halve the request rate (multiplicative decrease), down to 1/16 of the maximum."""
+        self.rate = max(self.max_rate / 16, self.rate / 2)
+
+    def throttle(self, delay: float):
+        """
+        React to a 429: pause for `delay` seconds and halve the rate. Every
+        in-flight request can hit the same 429, so the rate is only cut once
+        per pause window.
+        """
+        if self.last_refill <= time.monotonic():
+            self.slow_down()
+        self.pause(delay)
+
+    def speed_up(self):
+        """Raise the request rate by 2% of the maximum (additive increase), up to the maximum."""
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
 
 class AsyncMoltbookClient:
     """Async HTTP client for Moltbook API with retry logic."""
 
-    def __init__(self):
+    def __init__(self, rate_limit: float = RATE_LIMIT_PER_MINUTE):
         self.client = httpx.AsyncClient(
             base_url=BASE_URL,
             timeout=30.0,
+            # httpx advertises every encoding it can decode in Accept-Encoding:
+            # gzip/deflate always, plus br when brotli is installed (the fast extra)
             headers={"User-Agent": "MoltbookResearch/1.0"},
-            limits=httpx.Limits(max_connections=MAX_CONCURRENT, max_keepalive_connections=MAX_CONCURRENT)
+            # Multiplex concurrent requests over one connection when the server supports it
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONCURRENT,
+                max_keepalive_connections=MAX_CONCURRENT,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            )
         )
+        self.rate_limiter = RateLimiter(rate_limit / 60, MAX_CONCURRENT)
         self.request_count = 0
         self.not_found_count = 0  # Track 404/405 separately
 
@@ -220,12 +631,14 @@ class AsyncMoltbookClient:
         last_error = None
 
         for attempt in range(MAX_RETRIES + 1):
+            await self.rate_limiter.acquire()
             self.request_count += 1
 
             try:
                 response = await self.client.get(endpoint, params=params)
                 response.raise_for_status()
-                return response.json()
+                self.rate_limiter.speed_up()
+                return loads_json(response.content)
 
             except httpx.HTTPStatusError as e:
                 status = e.response.status_code
@@ -235,23 +648,28 @@ class AsyncMoltbookClient:
                     self.not_found_count += 1
                     return None
 
-                # 5xx errors are retryable
-                if status >= 500 and attempt < MAX_RETRIES:
-                    delay = RETRY_BACKOFF_BASE ** attempt
-                    console.print(f"[yellow]HTTP {status} on {endpoint}, retrying in {delay}s...[/yellow]")
-                    await asyncio.sleep(delay)
+                # 429 (rate limited) and 5xx errors are retryable
+                if (status == 429 or status >= 500) and attempt < MAX_RETRIES:
+                    delay = retry_delay(e.response, attempt)
+                    console.print(f"[yellow]HTTP {status} on {endpoint}, retrying in {delay:.1f}s...[/yellow]")
+                    if status == 429:
+                        # Throttling applies to every request, not just this one;
+                        # the retry waits out the pause in acquire()
+                        self.rate_limiter.throttle(delay)
+                    else:
+                        await asyncio.sleep(delay)
                     last_error = e
                     continue
 
-                # 4xx (except 404/405) are not retryable
+                # Other 4xx errors are not retryable
                 console.print(f"[red]HTTP {status}: {endpoint}[/red]")
                 return None
 
             except httpx.RequestError as e:
                 # Network errors are retryable
                 if attempt < MAX_RETRIES:
-                    delay = RETRY_BACKOFF_BASE ** attempt
-                    console.print(f"[yellow]Network error on {endpoint}, retrying in {delay}s...[/yellow]")
+                    delay = backoff_delay(attempt)
+                    console.print(f"[yellow]Network error on {endpoint}, retrying in {delay:.1f}s...[/yellow]")
                     await asyncio.sleep(delay)
                     last_error = e
                     continue
@@ -268,77 +686,141 @@ class AsyncMoltbookClient:
             console.print(f"[red]Failed after {MAX_RETRIES} retries: {endpoint}[/red]")
         return None
 
+    async def warmup(self):
+        """
+        Open a connection to the API before the first real request needs it.
+
+        Lets the TCP/TLS handshake overlap with local startup work; the
+        response itself is ignored.
+        """
+        await self.rate_limiter.acquire()
+        self.request_count += 1
+        try:
+            await self.client.head("/")
+        except httpx.HTTPError:
+            pass
+
     async def close(self):
         await self.client.aclose()
 
 
 def extract_names_from_response(data: dict, state: DownloadState):
     """Extract agent and submolt names from any API response for later fetching."""
+    # Bound once; the helpers below call these for every author
+    discover_agent = state.discover_agent
+    discover_submolt = state.discover_submolt
 
     def extract_from_author(author):
         if author and isinstance(author, dict):
             name = author.get("name") or author.get("username")
             if name:
-                state.agent_names_discovered.add(name)
+                discover_agent(name)
 
     def extract_from_submolt(submolt):
         if submolt and isinstance(submolt, dict):
             name = submolt.get("name") or submolt.get("slug")
             if name:
-                state.submolt_names_discovered.add(name)
-
-    def extract_from_comments(comments):
-        for comment in comments or []:
-            extract_from_author(comment.get("author"))
-            extract_from_comments(comment.get("replies", []))
+                discover_submolt(name)
+
+    def comment_authors(comments):
+        # Walk reply trees with an explicit stack so deep threads can't hit the recursion limit.
+        # Author handling is inlined since this runs once per comment.
+        stack = list(comments or [])
+        while stack:
+            comment = stack.pop()
+            author = comment.get("author")
+            if author and isinstance(author, dict):
+                name = author.get("name") or author.get("username")
+                if name:
+                    yield name
+            replies = comment.get("replies")
+            if replies:
+                stack.extend(replies)
 
     # Extract from post
-    post = data.get("post", {})
+    post = data.get("post", _EMPTY_DICT)
     extract_from_author(post.get("author"))
     extract_from_submolt(post.get("submolt"))
 
-    # Extract from comments
-    extract_from_comments(data.get("comments", []))
+    # Extract from comments, in bulk since authors repeat across a thread
+    state.discover_agents(comment_authors(data.get("comments", ())))
 
     # Extract from agent profile
-    agent = data.get("agent", {})
+    agent = data.get("agent", _EMPTY_DICT)
     if agent:
         name = agent.get("name")
         if name:
-            state.agent_names_discovered.add(name)
+            discover_agent(name)
 
     # Extract from submolt
-    submolt = data.get("submolt", {})
+    submolt = data.get("submolt", _EMPTY_DICT)
     extract_from_submolt(submolt)
 
 
-async def fetch_all_post_ids(client: AsyncMoltbookClient) -> list[dict]:
-    """Fetch all posts from the feed to get their IDs and basic info."""
-    all_posts = []
+async def paginate(client: AsyncMoltbookClient, endpoint: str, key: str, params: dict | None = None, limit: int = 100):
+    """
+    Yield successive pages of `key` items from an offset-paginated endpoint.
+
+    The following page is requested while the current one is still in
+    flight, so consecutive pages overlap instead of paying a full round
+    trip each. Its offset is guessed from the last observed page step
+    (initially `limit`); if the server reports a different next_offset the
+    speculative request is discarded. Pacing comes from the client's rate
+    limiter.
+    """
+    base_params = dict(params or {})
+
+    def request(offset: int) -> asyncio.Task:
+        return asyncio.create_task(client.get(endpoint, params={**base_params, "offset": offset, "limit": limit}))
+
     offset = 0
+    step = limit
+    current = request(offset)
+    ahead = None
 
-    console.print("[bold blue]Fetching post list from feed...[/bold blue]")
+    try:
+        while True:
+            ahead = request(offset + step)
+            data = await current
+
+            if not data or not data.get("success"):
+                console.print(f"[yellow]Failed to fetch {endpoint} at offset {offset}[/yellow]")
+                return
+
+            items = data.get(key, [])
+            if not items:
+                return
+
+            yield items
+
+            if not data.get("has_more", False):
+                return
+
+            next_offset = data.get("next_offset", offset + len(items))
+            if next_offset == offset + step:
+                current = ahead
+            else:
+                ahead.cancel()
+                current = request(next_offset)
+                if next_offset > offset:
+                    step = next_offset - offset
+            offset = next_offset
+    finally:
+        for task in (current, ahead):
+            if task is not None and not task.done():
+                task.cancel()
 
-    while True:
-        data = await client.get("/posts", params={"sort": "new", "offset": offset, "limit": 100})
 
-        if not data or not data.get("success"):
-            console.print(f"[yellow]Failed to fetch posts at offset {offset}[/yellow]")
-            break
+async def fetch_all_post_ids(client: AsyncMoltbookClient) -> list[dict]:
+    """Fetch all posts from the feed to get their IDs and basic info."""
+    all_posts = []
 
-        posts = data.get("posts", [])
-        if not posts:
-            break
+    console.print("[bold blue]Fetching post list from feed...[/bold blue]")
 
+    async for posts in paginate(client, "/posts", "posts", params={"sort": "new"}):
         all_posts.extend(posts)
         console.print(f"  Fetched {len(all_posts)} post IDs...", end="\r")
 
-        if not data.get("has_more", False):
-            break
-
-        offset = data.get("next_offset", offset + len(posts))
-        await asyncio.sleep(0.1)
-
     console.print(f"\n[green]Found {len(all_posts)} total posts[/green]")
 
     # Reverse to get oldest first
@@ -353,7 +835,7 @@ async def fetch_post_with_comments(client: AsyncMoltbookClient, post_id: str) ->
         return None
 
     # Add metadata but preserve ALL original fields
-    data["_downloaded_at"] = datetime.now(timezone.utc).isoformat()
+    data["_downloaded_at"] = now_iso()
     data["_endpoint"] = f"/posts/{post_id}"
     return data
 
@@ -361,28 +843,12 @@ async def fetch_post_with_comments(client: AsyncMoltbookClient, post_id: str) ->
 async def fetch_submolt_list(client: AsyncMoltbookClient) -> list[dict]:
     """Fetch submolt list to discover all submolt names."""
     all_submolts = []
-    offset = 0
 
     console.print("[bold blue]Fetching submolt list...[/bold blue]")
 
-    while True:
-        data = await client.get("/submolts", params={"offset": offset, "limit": 100})
-
-        if not data or not data.get("success"):
-            break
-
-        submolts = data.get("submolts", [])
-        if not submolts:
-            break
-
+    async for submolts in paginate(client, "/submolts", "submolts"):
         all_submolts.extend(submolts)
 
-        if not data.get("has_more", False):
-            break
-
-        offset = data.get("next_offset", offset + len(submolts))
-        await asyncio.sleep(0.1)
-
     console.print(f"[green]Found {len(all_submolts)} submolts[/green]")
     return all_submolts
 
@@ -393,7 +859,7 @@ async def fetch_submolt_details(client: AsyncMoltbookClient, name: str) -> dict
     if not data or not data.get("success"):
         return None
 
-    data["_downloaded_at"] = datetime.now(timezone.utc).isoformat()
+    data["_downloaded_at"] = now_iso()
     data["_endpoint"] = f"/submolts/{name}"
     return data
 
@@ -404,93 +870,193 @@ async def fetch_agent_profile(client: AsyncMoltbookClient, name: str) -> dict |
     if not data or not data.get("success"):
         return None
 
-    data["_downloaded_at"] = datetime.now(timezone.utc).isoformat()
+    data["_downloaded_at"] = now_iso()
     data["_endpoint"] = f"/agents/profile?name={name}"
     return data
 
 
-def generate_submolts_index(submolts_dir: Path):
+async def process_post(
+    client: AsyncMoltbookClient,
+    state: DownloadState,
+    posts_dir: Path,
+    post_id: str,
+    refresh: bool,
+    pretty: bool = False,
+    pool: ThreadPoolExecutor | None = None
+) -> tuple[bool, bool]:
     """
-    Generate an index.json file listing all submolts with basic metadata.
+    Fetch a post, record the names it mentions, save it and mark it done.
 
-    This allows browsing the full list even when directory listing is truncated
-    (GitHub truncates at 1000 entries).
+    Everything that needs the response happens here in one pass, so the
+    download loop only has to count outcomes. The save runs in a worker
+    thread from pool so it overlaps with requests still in flight; the post is only
+    marked done once it's on disk. Returns (downloaded, archived).
     """
-    index_entries = []
+    result = await fetch_post_with_comments(client, post_id)
+    if result is None:
+        return False, False
 
-    for filepath in sorted(submolts_dir.glob("*.json")):
-        if filepath.name == "index.json":
-            continue
+    # Extract names for later fetching
+    extract_names_from_response(result, state)
 
-        try:
-            data = json.loads(filepath.read_text())
-            submolt = data.get("submolt", {})
+    archived = await asyncio.get_running_loop().run_in_executor(
+        pool, store_post, posts_dir, post_id, result, refresh, pretty
+    )
+    state.mark_post_done(post_id, result.get("post", _EMPTY_DICT).get("comment_count", 0))
+    return True, archived
+
+
+async def fetch_and_store(
+    fetch,
+    client: AsyncMoltbookClient,
+    name: str,
+    save_dir: Path,
+    pretty: bool = False,
+    pool: ThreadPoolExecutor | None = None
+) -> dict | None:
+    """Fetch a submolt/agent with the given fetch function and save it from a worker thread in pool."""
+    result = await fetch(client, name)
+    if result is not None:
+        # Save RAW response with sanitized filename
+        filepath = save_dir / f"{sanitize_filename(name)}.json"
+        await asyncio.get_running_loop().run_in_executor(
+            pool, functools.partial(write_json, filepath, result, indent=pretty)
+        )
+    return result
 
-            index_entries.append({
-                "name": submolt.get("name", filepath.stem),
-                "display_name": submolt.get("display_name"),
-                "subscriber_count": submolt.get("subscriber_count", 0),
-                "file": filepath.name,
-            })
-        except (json.JSONDecodeError, OSError):
-            # Include files we couldn't parse with minimal info
-            index_entries.append({
-                "name": filepath.stem,
-                "file": filepath.name,
-            })
 
-    index_path = submolts_dir / "index.json"
-    index_data = {
-        "count": len(index_entries),
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-        "submolts": index_entries,
-    }
-    index_path.write_text(json.dumps(index_data, indent=2))
-    console.print(f"[green]Generated submolts index with {len(index_entries)} entries[/green]")
+async def as_completed_bounded(items: list, worker):
+    """
+    Run worker(item) for every item with at most MAX_CONCURRENT in flight,
+    yielding (item, result) pairs in completion order.
+
+    A fixed pool of MAX_CONCURRENT tasks pulls items from a shared iterator,
+    so a new request starts as soon as any worker frees up (one slow
+    response doesn't hold back the rest the way a batch barrier does) and
+    only MAX_CONCURRENT coroutines exist regardless of how many items there
+    are. Exceptions raised by worker are yielded as the result.
+    """
+    remaining = iter(items)
+    finished = asyncio.Queue()
 
+    async def run():
+        for item in remaining:
+            try:
+                result = await worker(item)
+            except Exception as e:
+                result = e
+            finished.put_nowait((item, result))
 
-def generate_agents_index(agents_dir: Path):
+    workers = [asyncio.create_task(run()) for _ in range(min(MAX_CONCURRENT, len(items)))]
+    try:
+        for _ in range(len(items)):
+            yield await finished.get()
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+def load_index_cache(index_path: Path, key: str) -> tuple[dict[str, dict], float]:
     """
-    Generate an index.json file listing all agents with basic metadata.
+    Read a previously generated index so unchanged files needn't be re-parsed.
 
-    This allows browsing the full list even when directory listing is truncated
-    (GitHub truncates at 1000 entries).
+    Returns (entries keyed by file name, index mtime). Files modified before
+    the index was written can reuse their entry; anything newer (downloaded
+    this run or edited since) must be parsed again.
     """
+    try:
+        index_mtime = index_path.stat().st_mtime
+        entries = loads_json(index_path.read_bytes())[key]
+        return {entry["file"]: entry for entry in entries}, index_mtime
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        return {}, float("-inf")
+
+
+def generate_index(directory: Path, key: str, item_key: str, build_entry):
+    """
+    Write directory/index.json listing every saved file under `key`.
+
+    Each file's `item_key` object is passed to build_entry(item, filepath)
+    to produce its entry. Entries for files unchanged since the previous
+    index are reused rather than re-parsed, and files that can't be parsed
+    are listed with minimal info.
+    """
+    index_path = directory / "index.json"
+    cached, index_mtime = load_index_cache(index_path, key)
     index_entries = []
 
-    for filepath in sorted(agents_dir.glob("*.json")):
-        if filepath.name == "index.json":
-            continue
+    files = sorted(f for f in directory.glob("*.json") if f.name != "index.json")
+    unchanged = {f for f in files if f.name in cached and f.stat().st_mtime < index_mtime}
+    parsed = dict(read_json_files([f for f in files if f not in unchanged], lambda data: data.get(item_key, {})))
 
-        try:
-            data = json.loads(filepath.read_text())
-            agent = data.get("agent", {})
+    for filepath in files:
+        if filepath in unchanged:
+            index_entries.append(cached[filepath.name])
+            continue
 
-            index_entries.append({
-                "name": agent.get("name", filepath.stem),
-                "karma": agent.get("karma", 0),
-                "follower_count": agent.get("follower_count", 0),
-                "file": filepath.name,
-            })
-        except (json.JSONDecodeError, OSError):
+        item = parsed[filepath]
+        if item is None:
             # Include files we couldn't parse with minimal info
             index_entries.append({
                 "name": filepath.stem,
                 "file": filepath.name,
             })
+            continue
+
+        index_entries.append(build_entry(item, filepath))
 
-    index_path = agents_dir / "index.json"
     index_data = {
         "count": len(index_entries),
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-        "agents": index_entries,
+        "generated_at": now_iso(),
+        key: index_entries,
     }
-    index_path.write_text(json.dumps(index_data, indent=2))
-    console.print(f"[green]Generated agents index with {len(index_entries)} entries[/green]")
+    write_json(index_path, index_data)
+    console.print(f"[green]Generated {key} index with {len(index_entries)} entries ({len(unchanged)} unchanged)[/green]")
 
 
-async def download_all_async(data_dir: Path, resume: bool = True):
-    """Main async download function."""
+def generate_submolts_index(submolts_dir: Path):
+    """
+    Generate an index.json file listing all submolts with basic metadata.
+
+    This allows browsing the full list even when directory listing is truncated
+    (GitHub truncates at 1000 entries).
+    """
+    generate_index(submolts_dir, "submolts", "submolt", lambda submolt, filepath: {
+        "name": submolt.get("name", filepath.stem),
+        "display_name": submolt.get("display_name"),
+        "subscriber_count": submolt.get("subscriber_count", 0),
+        "file": filepath.name,
+    })
+
+
+def generate_agents_index(agents_dir: Path):
+    """
+    Generate an index.json file listing all agents with basic metadata.
+
+    This allows browsing the full list even when directory listing is truncated
+    (GitHub truncates at 1000 entries).
+    """
+    generate_index(agents_dir, "agents", "agent", lambda agent, filepath: {
+        "name": agent.get("name", filepath.stem),
+        "karma": agent.get("karma", 0),
+        "follower_count": agent.get("follower_count", 0),
+        "file": filepath.name,
+    })
+
+
+async def download_all_async(
+    data_dir: Path,
+    resume: bool = True,
+    pretty: bool = False,
+    rate_limit: float = RATE_LIMIT_PER_MINUTE
+):
+    """
+    Main async download function.
+
+    Downloaded items are saved as compact JSON unless pretty is set; the
+    checkpoint and index files are always indented. rate_limit caps API
+    requests per minute.
+    """
 
     # Setup directories
     posts_dir = data_dir / "posts"
@@ -503,60 +1069,61 @@ async def download_all_async(data_dir: Path, resume: bool = True):
 
     checkpoint_path = data_dir / "checkpoint.json"
 
-    # Load checkpoint
-    state = DownloadState.load(checkpoint_path) if resume else DownloadState()
+    # One thread per worker's save plus one for checkpoint writes, so saves never
+    # queue behind each other on machines where the default pool is smaller.
+    # A dedicated pool rather than set_default_executor(), so callers running
+    # this inside their own event loop keep their executor.
+    pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT + 1)
 
-    # Migrate existing data if needed (backfill comment counts)
-    if state.posts_with_details and not state.post_comment_counts:
-        console.print("[cyan]Migrating existing posts to comment tracking...[/cyan]")
-        migrated = migrate_comment_counts(data_dir, state)
-        console.print(f"[green]Migrated {migrated} posts[/green]")
-        state.save(checkpoint_path)
+    client = AsyncMoltbookClient(rate_limit)
+    # Connect while the checkpoint loads instead of on the first feed request
+    warmup = asyncio.create_task(client.warmup())
 
-    if resume and state.last_checkpoint:
-        console.print(f"[cyan]Resuming from checkpoint: {state.last_checkpoint}[/cyan]")
-        console.print(f"  Posts: {len(state.posts_with_details)}")
-        console.print(f"  Posts with tracked counts: {len(state.post_comment_counts)}")
-        console.print(f"  Submolts: {len(state.submolts_fetched)}")
-        console.print(f"  Agents: {len(state.agents_fetched)}")
+    try:
+        # Load checkpoint
+        state = await asyncio.to_thread(DownloadState.load, checkpoint_path) if resume else DownloadState()
 
-    client = AsyncMoltbookClient()
+        # Migrate existing data if needed (backfill comment counts)
+        if state.posts_with_details and not state.post_comment_counts:
+            console.print("[cyan]Migrating existing posts to comment tracking...[/cyan]")
+            migrated = await asyncio.to_thread(migrate_comment_counts, data_dir, state)
+            console.print(f"[green]Migrated {migrated} posts[/green]")
+            await state.save_async(checkpoint_path, compact=True, pool=pool)
+
+        if resume and state.last_checkpoint:
+            console.print(f"[cyan]Resuming from checkpoint: {state.last_checkpoint}[/cyan]")
+            console.print(f"  Posts: {len(state.posts_with_details)}")
+            console.print(f"  Posts with tracked counts: {len(state.post_comment_counts)}")
+            console.print(f"  Submolts: {len(state.submolts_fetched)}")
+            console.print(f"  Agents: {len(state.agents_fetched)}")
+
+        await warmup
 
-    try:
         # ============================================================
         # PHASE 1: Get all post IDs and fetch posts with comments
         # ============================================================
         all_posts = await fetch_all_post_ids(client)
 
-        # Extract agent/submolt names from feed data
-        for post in all_posts:
-            author = post.get("author")
-            if author:
-                name = author.get("name") or author.get("username")
-                if name:
-                    state.agent_names_discovered.add(name)
-            submolt = post.get("submolt")
-            if submolt:
-                name = submolt.get("name")
-                if name:
-                    state.submolt_names_discovered.add(name)
-
-        # Categorize posts: new vs needing refresh (comment count increased)
-        new_posts, posts_to_refresh = identify_posts_needing_refresh(all_posts, state)
-        all_posts_to_fetch = new_posts + posts_to_refresh
-        refresh_ids = {p["id"] for p in posts_to_refresh}
+        # Extract agent/submolt names from feed data and categorize posts:
+        # new vs needing refresh (comment count increased)
+        new_posts, posts_to_refresh = scan_feed_posts(all_posts, state)
+        post_ids = new_posts + posts_to_refresh
+        refresh_ids = set(posts_to_refresh)
+        # Only IDs are needed from here on; free the feed summaries
+        del all_posts
 
         if new_posts:
             console.print(f"[blue]New posts to download: {len(new_posts)}[/blue]")
         if posts_to_refresh:
             console.print(f"[blue]Posts to refresh (new comments): {len(posts_to_refresh)}[/blue]")
 
-        if all_posts_to_fetch:
-            console.print(f"[bold blue]Fetching {len(all_posts_to_fetch)} posts with comments...[/bold blue]")
+        if post_ids:
+            console.print(f"[bold blue]Fetching {len(post_ids)} posts with comments...[/bold blue]")
 
             completed = 0
             failed = 0
             archived = 0
+            last_checkpoint_at = 0
 
             with Progress(
                 SpinnerColumn(),
@@ -566,53 +1133,30 @@ async def download_all_async(data_dir: Path, resume: bool = True):
                 TimeElapsedColumn(),
                 console=console,
             ) as progress:
-                task = progress.add_task("Downloading posts...", total=len(all_posts_to_fetch))
-
-                batch_size = MAX_CONCURRENT
-                for i in range(0, len(all_posts_to_fetch), batch_size):
-                    batch = all_posts_to_fetch[i:i + batch_size]
-
-                    tasks = [fetch_post_with_comments(client, p["id"]) for p in batch]
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                    for post_info, result in zip(batch, results):
-                        post_id = post_info["id"]
-
-                        if isinstance(result, Exception):
-                            console.print(f"[red]Error fetching {post_id}: {result}[/red]")
-                            failed += 1
-                            continue
-
-                        if result is None:
-                            failed += 1
-                            continue
-
-                        # Archive if this is a refresh and content changed
-                        if post_id in refresh_ids:
-                            if archive_post_if_changed(posts_dir, post_id, result):
-                                archived += 1
-
-                        # Save RAW response (current version)
-                        filepath = posts_dir / f"{post_id}.json"
-                        filepath.write_text(json.dumps(result, indent=2, default=str))
-
-                        # Extract names for later fetching
-                        extract_names_from_response(result, state)
-
-                        # Update tracking
-                        state.posts_with_details.add(post_id)
-                        comment_count = result.get("post", {}).get("comment_count", 0)
-                        state.post_comment_counts[post_id] = comment_count
+                task = progress.add_task("Downloading posts...", total=len(post_ids))
+
+                downloads = as_completed_bounded(
+                    post_ids,
+                    lambda post_id: process_post(client, state, posts_dir, post_id, post_id in refresh_ids, pretty, pool),
+                )
+                async for post_id, outcome in downloads:
+                    if isinstance(outcome, Exception):
+                        console.print(f"[red]Error fetching {post_id}: {outcome}[/red]")
+                        failed += 1
+                    elif not outcome[0]:
+                        failed += 1
+                    else:
                         completed += 1
+                        if outcome[1]:
+                            archived += 1
 
-                    progress.update(task, advance=len(batch), description=f"Posts: {completed} done, {archived} archived, {failed} failed")
-
-                    if completed % 100 == 0:
-                        state.save(checkpoint_path)
+                    progress.update(task, advance=1, description=f"Posts: {completed} done, {archived} archived, {failed} failed")
 
-                    await asyncio.sleep(BATCH_DELAY)
+                    if completed - last_checkpoint_at >= CHECKPOINT_INTERVAL:
+                        await state.save_async(checkpoint_path, pool=pool)
+                        last_checkpoint_at = completed
 
-            state.save(checkpoint_path)
+            await state.save_async(checkpoint_path, pool=pool)
             console.print(f"[green]Posts complete: {completed} downloaded, {archived} archived, {failed} failed[/green]")
 
         # ============================================================
@@ -623,9 +1167,9 @@ async def download_all_async(data_dir: Path, resume: bool = True):
         for s in submolt_list:
             name = s.get("name") or s.get("slug")
             if name:
-                state.submolt_names_discovered.add(name)
+                state.discover_submolt(name)
 
-        submolts_to_fetch = [n for n in state.submolt_names_discovered if n not in state.submolts_fetched]
+        submolts_to_fetch = list(state.submolt_names_discovered)
 
         if submolts_to_fetch:
             console.print(f"[bold blue]Fetching {len(submolts_to_fetch)} submolt details...[/bold blue]")
@@ -643,35 +1187,21 @@ async def download_all_async(data_dir: Path, resume: bool = True):
             ) as progress:
                 task = progress.add_task("Downloading submolts...", total=len(submolts_to_fetch))
 
-                batch_size = MAX_CONCURRENT
-                for i in range(0, len(submolts_to_fetch), batch_size):
-                    batch = submolts_to_fetch[i:i + batch_size]
-
-                    tasks = [fetch_submolt_details(client, name) for name in batch]
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                    for name, result in zip(batch, results):
-                        if isinstance(result, Exception):
-                            failed += 1
-                            continue
-
-                        if result is None:
-                            failed += 1
-                            continue
-
-                        # Save RAW response with sanitized filename
-                        safe_name = sanitize_filename(name)
-                        filepath = submolts_dir / f"{safe_name}.json"
-                        filepath.write_text(json.dumps(result, indent=2, default=str))
-
+                downloads = as_completed_bounded(
+                    submolts_to_fetch,
+                    lambda name: fetch_and_store(fetch_submolt_details, client, name, submolts_dir, pretty, pool),
+                )
+                async for name, result in downloads:
+                    if isinstance(result, Exception) or result is None:
+                        failed += 1
+                    else:
                         extract_names_from_response(result, state)
-                        state.submolts_fetched.add(name)
+                        state.mark_submolt_done(name)
                         completed += 1
 
-                    progress.update(task, advance=len(batch), description=f"Submolts: {completed} done, {failed} failed")
-                    await asyncio.sleep(BATCH_DELAY)
+                    progress.update(task, advance=1, description=f"Submolts: {completed} done, {failed} failed")
 
-            state.save(checkpoint_path)
+            await state.save_async(checkpoint_path, pool=pool)
             console.print(f"[green]Submolts complete: {completed} downloaded, {failed} failed[/green]")
 
         # Generate submolts index for browsing (directory listing gets truncated at 1000 entries)
@@ -680,13 +1210,14 @@ async def download_all_async(data_dir: Path, resume: bool = True):
         # ============================================================
         # PHASE 3: Fetch all agent profiles
         # ============================================================
-        agents_to_fetch = [n for n in state.agent_names_discovered if n not in state.agents_fetched]
+        agents_to_fetch = list(state.agent_names_discovered)
 
         if agents_to_fetch:
             console.print(f"[bold blue]Fetching {len(agents_to_fetch)} agent profiles...[/bold blue]")
 
             completed = 0
             failed = 0
+            last_checkpoint_at = 0
 
             with Progress(
                 SpinnerColumn(),
@@ -698,43 +1229,32 @@ async def download_all_async(data_dir: Path, resume: bool = True):
             ) as progress:
                 task = progress.add_task("Downloading agents...", total=len(agents_to_fetch))
 
-                batch_size = MAX_CONCURRENT
-                for i in range(0, len(agents_to_fetch), batch_size):
-                    batch = agents_to_fetch[i:i + batch_size]
-
-                    tasks = [fetch_agent_profile(client, name) for name in batch]
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                    for name, result in zip(batch, results):
-                        if isinstance(result, Exception):
-                            failed += 1
-                            continue
-
-                        if result is None:
-                            failed += 1
-                            continue
-
-                        # Save RAW response with sanitized filename
-                        safe_name = sanitize_filename(name)
-                        filepath = agents_dir / f"{safe_name}.json"
-                        filepath.write_text(json.dumps(result, indent=2, default=str))
-
-                        state.agents_fetched.add(name)
+                downloads = as_completed_bounded(
+                    agents_to_fetch,
+                    lambda name: fetch_and_store(fetch_agent_profile, client, name, agents_dir, pretty, pool),
+                )
+                async for name, result in downloads:
+                    if isinstance(result, Exception) or result is None:
+                        failed += 1
+                    else:
+                        state.mark_agent_done(name)
                         completed += 1
 
-                    progress.update(task, advance=len(batch), description=f"Agents: {completed} done, {failed} failed")
+                    progress.update(task, advance=1, description=f"Agents: {completed} done, {failed} failed")
 
-                    if completed % 100 == 0:
-                        state.save(checkpoint_path)
+                    if completed - last_checkpoint_at >= CHECKPOINT_INTERVAL:
+                        await state.save_async(checkpoint_path, pool=pool)
+                        last_checkpoint_at = completed
 
-                    await asyncio.sleep(BATCH_DELAY)
-
-            state.save(checkpoint_path)
+            await state.save_async(checkpoint_path, pool=pool)
             console.print(f"[green]Agents complete: {completed} downloaded, {failed} failed[/green]")
 
         # Generate agents index for browsing (directory listing gets truncated at 1000 entries)
         generate_agents_index(agents_dir)
 
+        # Fold this run's journal into a single checkpoint snapshot
+        await state.save_async(checkpoint_path, compact=True, pool=pool)
+
         # ============================================================
         # Final summary
         # ============================================================
@@ -747,12 +1267,14 @@ async def download_all_async(data_dir: Path, resume: bool = True):
             console.print(f"  Not found (404/405): {client.not_found_count}")
 
     finally:
+        warmup.cancel()
         await client.close()
+        pool.shutdown()
 
 
-def download_all(resume: bool = True):
+def download_all(resume: bool = True, pretty: bool = False, rate_limit: float = RATE_LIMIT_PER_MINUTE):
     """Sync wrapper for async download."""
-    asyncio.run(download_all_async(DATA_DIR, resume=resume))
+    asyncio.run(download_all_async(DATA_DIR, resume=resume, pretty=pretty, rate_limit=rate_limit))
 
 
 def main():
@@ -773,14 +1295,32 @@ def main():
         default=Path("data"),
         help="Directory to store downloaded data"
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Save downloaded items as indented JSON instead of compact JSON"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=RATE_LIMIT_PER_MINUTE,
+        help=f"Maximum API requests per minute (default: {RATE_LIMIT_PER_MINUTE})"
+    )
 
     args = parser.parse_args()
+    if args.rate_limit <= 0:
+        parser.error("--rate-limit must be positive")
 
     console.print("[bold]Moltbook Data Downloader[/bold]")
     console.print(f"Data directory: {args.data_dir.absolute()}")
     console.print()
 
-    asyncio.run(download_all_async(args.data_dir, resume=not args.no_resume))
+    asyncio.run(download_all_async(
+        args.data_dir,
+        resume=not args.no_resume,
+        pretty=args.pretty,
+        rate_limit=args.rate_limit,
+    ))
 
 
 if __name__ == "__main__":